@@ -0,0 +1,504 @@
+import asyncio
+import collections
+import functools
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+import threading
+import time
+from types import MappingProxyType
+import httpx
+from dotenv import load_dotenv
+import streamlit as st
+from langchain_community.graphs.graph_store import GraphStore
+from langchain_groq import ChatGroq
+from langchain.chains import GraphCypherQAChain
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.prompts import PromptTemplate, StringPromptTemplate
+import re
+from neo4j import GraphDatabase, RoutingControl
+
+# -----------------------------
+# Load environment variables — the dotenv file is parsed exactly once
+# per process, not on every rerun
+# -----------------------------
+@st.cache_resource
+def load_env():
+    load_dotenv()
+    return {k: os.getenv(k) for k in ("GROQ_API_KEY", "NEO4J_URI", "NEO4J_USERNAME", "NEO4J_PASSWORD")}
+
+# Logging goes through a queue to a background listener thread so the
+# request thread never blocks on synchronous stdout writes
+@st.cache_resource
+def get_logger():
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, logging.StreamHandler())
+    listener.start()
+    logger = logging.getLogger("cypher_qa")
+    logger.setLevel(logging.WARNING)
+    logger.addHandler(QueueHandler(log_queue))
+    return logger
+
+logger = get_logger()
+
+_env = load_env()
+GROQ_API_KEY = _env["GROQ_API_KEY"]
+NEO4J_URI = _env["NEO4J_URI"]
+NEO4J_USER = _env["NEO4J_USERNAME"]
+NEO4J_PASS = _env["NEO4J_PASSWORD"]
+
+# -----------------------------
+# Cached factories — heavy objects are built once per process and
+# reused across Streamlit reruns instead of on every interaction
+# -----------------------------
+@st.cache_resource
+def get_driver():
+    # Single long-lived driver shared by every code path; pool size is a
+    # config knob (NEO4J_POOL) so it can be tuned without a code change
+    return GraphDatabase.driver(
+        NEO4J_URI,
+        auth=(NEO4J_USER, NEO4J_PASS),
+        max_connection_pool_size=int(os.getenv("NEO4J_POOL", "32")),
+        connection_acquisition_timeout=30,
+        keep_alive=True,
+    )
+
+driver = get_driver()
+
+# Queries containing mutation keywords must go to the leader; everything
+# else is routed to followers to keep read latency and leader load down
+_WRITE_KEYWORDS = re.compile(r"\b(CREATE|MERGE|DELETE|SET|REMOVE|DROP)\b", re.IGNORECASE)
+
+def _routing_for(query):
+    return RoutingControl.WRITE if _WRITE_KEYWORDS.search(query) else RoutingControl.READ
+
+# The LLM often regenerates identical Cypher for repeated questions —
+# cache read results keyed on the whitespace-normalized query so those
+# hit memory instead of Bolt
+@functools.lru_cache(maxsize=512)
+def _cached_read(q_norm):
+    records, _, _ = driver.execute_query(q_norm, database_="neo4j", routing_=RoutingControl.READ)
+    return tuple(record.data() for record in records)
+
+# Safe query runner — execute_query manages sessions via the shared pool
+def run_cypher(query, params={}):
+    routing = _routing_for(query)
+    if params or routing is RoutingControl.WRITE:
+        if routing is RoutingControl.WRITE:
+            # The graph is mutating — cached reads may now be stale
+            _cached_read.cache_clear()
+        records, _, _ = driver.execute_query(
+            query, parameters_=params, database_="neo4j", routing_=routing
+        )
+        return [record.data() for record in records]
+    return list(_cached_read(" ".join(query.split())))
+
+# Fetch the schema once at startup and pin it into the prompt — the
+# LLM would otherwise generate Cypher blind, and every hallucinated
+# label costs a full retry round-trip. The result is consumed into
+# STATIC_PREFIX at import, so it stays frozen for the process lifetime;
+# restart the app to pick up schema changes.
+@st.cache_resource
+def get_schema():
+    try:
+        records, _, _ = driver.execute_query(
+            "CALL apoc.meta.schema()", database_="neo4j", routing_=RoutingControl.READ
+        )
+        meta = records[0]["value"]
+    except Exception:
+        # APOC unavailable or database unreachable at startup — run without schema
+        return ""
+    lines = []
+    for name, info in meta.items():
+        if info.get("type") == "node":
+            line = f"(:{name}) properties: {', '.join(sorted(info.get('properties', {})))}"
+            rels = ", ".join(sorted(info.get("relationships", {})))
+            if rels:
+                line += f"; relationships: {rels}"
+            lines.append(line)
+    if not lines:
+        return ""
+    # Escape braces so the schema text survives the prompt render
+    summary = "Graph schema:\n" + "\n".join(lines) + "\n"
+    return summary.replace("{", "{{").replace("}", "}}")
+
+class SharedDriverGraph(GraphStore):
+    """Minimal graph store over the shared cached driver. Unlike
+    Neo4jGraph it holds no private second driver/pool, so the tuned
+    NEO4J_POOL settings govern every connection in the process."""
+
+    @property
+    def get_schema(self):
+        return ""
+
+    @property
+    def get_structured_schema(self):
+        return {}
+
+    def query(self, query, params={}):
+        return run_cypher(query, params)
+
+    def refresh_schema(self):
+        # Schema is pinned into the prompt by get_schema() instead
+        pass
+
+    def add_graph_documents(self, graph_documents, include_source=False):
+        raise NotImplementedError("This app only reads from the graph.")
+
+@st.cache_resource
+def get_graph():
+    return SharedDriverGraph()
+
+@st.cache_resource
+def get_llm(streaming=False):
+    # Shared HTTP/2 clients with keep-alive so calls reuse (and batched
+    # calls multiplex over) warm connections instead of paying a TCP/TLS
+    # handshake per request. Streaming stays off for the Cypher model so
+    # only the answer model ever emits on_llm_new_token.
+    limits = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+    return ChatGroq(
+        model="llama-3.1-8b-instant",
+        groq_api_key=GROQ_API_KEY,
+        streaming=streaming,
+        http_client=httpx.Client(http2=True, timeout=60, limits=limits),
+        http_async_client=httpx.AsyncClient(http2=True, timeout=60, limits=limits),
+    )
+
+# -----------------------------
+# Few-shot examples — an immutable tuple of read-only mappings so the
+# structure is hashable and nothing can reorder or rebuild it per rerun
+# -----------------------------
+# Three diverse examples (count, filter-by-name, aggregate) — prompt
+# tokens dominate latency for a fast model, so redundant examples and
+# verbose rules cost prefill time on every single call
+EXAMPLES = tuple(MappingProxyType(e) for e in [
+    {"question": "How many artists are there?", "query": "MATCH (a:Person)-[:ACTED_IN]->(:Movie) RETURN count(DISTINCT a)"},
+    {"question": "Which actors played in the movie Casino?", "query": "MATCH (m:Movie {{title: 'Casino'}})<-[:ACTED_IN]-(a) RETURN a.name"},
+    {"question": "List all the genres of the movie Jumanji", "query": "MATCH (m:Movie {{title: 'Jumanji'}})-[:IN_GENRE]->(g:Genre) RETURN g.name"},
+])
+
+def _normalize_question(question):
+    return re.sub(r"[^\w\s]", "", question.lower()).strip()
+
+# Canonical question -> Cypher pairs: the example questions already have
+# human-written queries, so exact matches (after normalization) go
+# straight to the graph with zero LLM tokens. Unescape the {{ }} the
+# template engine needed since these run verbatim.
+CANON = {
+    _normalize_question(e["question"]): e["query"].replace("{{", "{").replace("}}", "}")
+    for e in EXAMPLES
+}
+
+prefix = """You are a strict Cypher expert: return only a valid Cypher query (MATCH/WHERE/RETURN, never SQL), with no explanations or comments, using only labels and properties present in the schema.
+"""
+
+# All invariant text (rules + examples) is rendered once into a single
+# block that sits byte-stable at the front of every request, with only
+# the user question appended — the shape provider-side prompt-prefix
+# caching needs. Example order must never change between calls. The
+# examples are joined with a plain f-string, bypassing the template
+# engine entirely for the static block.
+EXAMPLES_TEXT = "\n\n".join(f"User input:{e['question']}\n Cypher query:{e['query']}" for e in EXAMPLES)
+STATIC_PREFIX = prefix + get_schema() + "\n" + EXAMPLES_TEXT
+
+class PreRenderedPrompt(StringPromptTemplate):
+    """Prompt rendered to its final text once up front — format() is a
+    single substitution instead of re-walking the whole template (and
+    its {{ }} escapes) on every call. Built on StringPromptTemplate
+    because PromptTemplate's validator would recompute input_variables
+    from the literal braces in the rendered example Cypher."""
+
+    template: str
+
+    def format(self, **kwargs):
+        return self.template.replace("__QUESTION__", kwargs["question"])
+
+@functools.cache
+def build_prompt():
+    rendered = PromptTemplate.from_template(
+        STATIC_PREFIX + "\nUser input: {question}\nCypher query: "
+    ).format(question="__QUESTION__")
+    return PreRenderedPrompt(template=rendered, input_variables=["question"])
+
+# -----------------------------
+# Initialize GraphCypherQAChain
+# -----------------------------
+# Leading underscores so Streamlit skips hashing the unhashable arguments
+@st.cache_resource
+def get_qa_chain(_graph, _llm, _qa_llm, _prompt):
+    return GraphCypherQAChain.from_llm(
+        graph=_graph,
+        llm=_llm,
+        qa_llm=_qa_llm,
+        cypher_prompt=_prompt,
+        verbose=False,
+        allow_dangerous_requests=True
+    )
+
+qa_chain = get_qa_chain(get_graph(), get_llm(), get_llm(streaming=True), build_prompt())
+
+# -----------------------------
+# Answer caching — repeat questions short-circuit without hitting
+# Groq or Neo4j, near-duplicates are matched by embedding similarity
+# -----------------------------
+SEMANTIC_THRESHOLD = 0.92
+ANSWER_TTL_S = 3600
+ANSWER_MAX_ENTRIES = 1024
+
+@st.cache_resource
+def get_embedder():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer("all-MiniLM-L6-v2")
+
+@st.cache_resource
+def get_semantic_cache():
+    # question -> (timestamp, embedding, response), shared across
+    # sessions and held to the same TTL/size bounds as the exact cache
+    # so the two layers cannot drift apart
+    return {}
+
+def _semantic_lookup(question):
+    cache = get_semantic_cache()
+    now = time.monotonic()
+    for key in [k for k, (ts, _, _) in cache.items() if now - ts > ANSWER_TTL_S]:
+        del cache[key]
+    if not cache:
+        return None
+    emb = get_embedder().encode(question, normalize_embeddings=True)
+    best_score, best_response = max(
+        ((float(emb @ cached_emb), response) for _, cached_emb, response in cache.values()),
+        key=lambda pair: pair[0],
+    )
+    return best_response if best_score > SEMANTIC_THRESHOLD else None
+
+def _semantic_store(question, response):
+    cache = get_semantic_cache()
+    if len(cache) >= ANSWER_MAX_ENTRIES:
+        cache.pop(next(iter(cache)))  # oldest insertion
+    emb = get_embedder().encode(question, normalize_embeddings=True)
+    cache[question] = (time.monotonic(), emb, response)
+
+@st.cache_resource
+def get_answer_cache():
+    # question -> (timestamp, response); an explicit dict rather than
+    # st.cache_data so the streaming path can check and seed it too
+    return {}
+
+def lookup_cached_answer(q_norm):
+    cache = get_answer_cache()
+    entry = cache.get(q_norm)
+    if entry is not None:
+        ts, response = entry
+        if time.monotonic() - ts <= ANSWER_TTL_S:
+            return response
+        del cache[q_norm]
+        # The paired semantic entry is just as stale — drop it too so it
+        # cannot serve the expired answer back via a cosine-1.0 match
+        get_semantic_cache().pop(q_norm, None)
+    return _semantic_lookup(q_norm)
+
+def store_answer(q_norm, response):
+    cache = get_answer_cache()
+    if len(cache) >= ANSWER_MAX_ENTRIES:
+        cache.pop(next(iter(cache)))  # oldest insertion
+    cache[q_norm] = (time.monotonic(), response)
+    _semantic_store(q_norm, response)
+
+# -----------------------------
+# Request batching — questions from all sessions are funnelled onto one
+# event-loop thread, coalesced for up to 50 ms and dispatched together
+# so concurrent Groq round-trips overlap instead of serializing
+# -----------------------------
+BATCH_WINDOW_S = 0.05
+BATCH_SIZE = 8
+
+async def _drain_batches(queue):
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + BATCH_WINDOW_S
+        while len(batch) < BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        try:
+            responses = await qa_chain.abatch([question for question, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+        else:
+            for (_, future), response in zip(batch, responses):
+                future.set_result(response)
+
+async def _submit(queue, question):
+    future = asyncio.get_running_loop().create_future()
+    await queue.put((question, future))
+    return await future
+
+@st.cache_resource
+def get_batch_loop():
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    queue = asyncio.Queue()
+    asyncio.run_coroutine_threadsafe(_drain_batches(queue), loop)
+    return loop, queue
+
+def answer(question: str) -> dict:
+    """Cached, batched, non-streaming path for programmatic callers."""
+    q_norm = question.strip().lower()
+    cached = lookup_cached_answer(q_norm)
+    if cached is not None:
+        return cached
+    loop, queue = get_batch_loop()
+    response = asyncio.run_coroutine_threadsafe(_submit(queue, question), loop).result()
+    store_answer(q_norm, response)
+    return response
+
+# Flush streamed chunks at most every 50 ms so Streamlit does not
+# rerender once per token
+FLUSH_INTERVAL_S = 0.05
+
+_STREAM_DONE = object()
+
+class _TokenQueueHandler(BaseCallbackHandler):
+    """Forwards answer tokens to a thread-safe queue. Only the QA model
+    has streaming enabled, so the Cypher-generation step never emits
+    tokens through this handler."""
+
+    def __init__(self, out):
+        self.out = out
+
+    def on_llm_new_token(self, token, **kwargs):
+        if token:
+            self.out.put(token)
+
+def stream_answer(question):
+    # GraphCypherQAChain has no native stream(); run it on the shared
+    # event-loop thread with a per-request token handler and yield the
+    # answer tokens as the QA model generates them
+    loop, _ = get_batch_loop()
+    tokens = queue.SimpleQueue()
+
+    async def _run():
+        return await qa_chain.ainvoke(question, config={"callbacks": [_TokenQueueHandler(tokens)]})
+
+    future = asyncio.run_coroutine_threadsafe(_run(), loop)
+    future.add_done_callback(lambda _: tokens.put(_STREAM_DONE))
+
+    pending = ""
+    last_flush = time.monotonic()
+    while True:
+        item = tokens.get()
+        if item is _STREAM_DONE:
+            break
+        pending += item
+        now = time.monotonic()
+        if pending and now - last_flush >= FLUSH_INTERVAL_S:
+            yield pending
+            pending = ""
+            last_flush = now
+    if pending:
+        yield pending
+    future.result()  # surface any chain error after the stream ends
+
+# -----------------------------
+# Streamlit Multi-tab UI — entry scripts call build_app(); the heavy
+# setup above runs once at import since Python caches this module
+# -----------------------------
+def build_app(enable_raw_cypher: bool = True, streaming: bool = True):
+    st.set_page_config(page_title="Neo4j Graph Q&A (Groq LLM)", layout="wide")
+    labels = ["Home / Q&A"]
+    if enable_raw_cypher:
+        labels.append("Raw Cypher")
+    labels.append("Chat History")
+    tabs = st.tabs(labels)
+
+    # -----------------------------
+    # Session state for chat history
+    # -----------------------------
+    # Bounded so a long-lived session cannot grow (and re-render) without limit
+    if "chat_history" not in st.session_state:
+        st.session_state.chat_history = collections.deque(maxlen=200)
+
+    # -----------------------------
+    # 1️⃣ Home / Q&A Tab
+    # -----------------------------
+    with tabs[0]:
+        st.header("Neo4j Graph Q&A")
+        # A form suppresses the per-keystroke reruns text_input would
+        # otherwise trigger — the script only re-executes on submit
+        with st.form("qa"):
+            user_question = st.text_input("Enter your question:")
+            submitted = st.form_submit_button("Get Answer")
+
+        if submitted:
+            if user_question:
+                try:
+                    q_norm = user_question.strip().lower()
+                    canned = CANON.get(_normalize_question(user_question))
+                    if canned is not None:
+                        # Canonical question — run its human-written
+                        # Cypher directly, no LLM hop at all
+                        results = run_cypher(canned)
+                        result = str(results) if results else "Query returned no results."
+                        st.success(result)
+                    elif (cached := lookup_cached_answer(q_norm)) is not None:
+                        result = cached['result']
+                        st.success(result)
+                    elif streaming:
+                        # Stream so the first tokens appear immediately
+                        # instead of waiting for the full generation.
+                        # Send the original text — casing matters for the
+                        # generated Cypher; q_norm is only the cache key
+                        result = st.write_stream(stream_answer(user_question))
+                        store_answer(q_norm, {"result": result})
+                    else:
+                        # Non-streaming variants go through the batched
+                        # answer() path so concurrent questions coalesce
+                        # into one abatch dispatch
+                        result = answer(user_question)['result']
+                        st.success(result)
+
+                    # Save to history
+                    st.session_state.chat_history.append({"type": "Graph QA", "question": user_question, "answer": result})
+                except Exception as e:
+                    logger.warning("Graph QA failed for %r: %s", user_question, e)
+                    st.error(f"Error: {e}")
+
+    # -----------------------------
+    # 2️⃣ Raw Cypher Tab
+    # -----------------------------
+    if enable_raw_cypher:
+        with tabs[1]:
+            st.header("Execute Raw Cypher Query")
+            cypher_query = st.text_area("Enter Cypher query (RETURN limited nodes for safety):")
+            if st.button("Run Query"):
+                if cypher_query:
+                    try:
+                        results = run_cypher(cypher_query)
+                        if results:
+                            st.write(results)
+                        else:
+                            st.info("Query returned no results.")
+                    except Exception as e:
+                        logger.warning("Raw Cypher failed: %s", e)
+                        st.error(f"Error executing Cypher: {e}")
+
+    # -----------------------------
+    # 3️⃣ Chat History Tab
+    # -----------------------------
+    with tabs[-1]:
+        st.header("Chat History")
+        if st.session_state.chat_history:
+            for chat in reversed(st.session_state.chat_history):
+                st.markdown(f"**Type:** {chat['type']}")
+                st.markdown(f"**Q:** {chat['question']}")
+                st.markdown(f"**A:** {chat['answer']}")
+                st.markdown("---")
+        else:
+            st.info("No history yet.")
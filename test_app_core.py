@@ -0,0 +1,53 @@
+import os
+
+# Dummy connection settings so app_core imports without a live database
+# (the driver connects lazily and get_schema() degrades to an empty block)
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("NEO4J_URI", "bolt://localhost:7687")
+os.environ.setdefault("NEO4J_USERNAME", "neo4j")
+os.environ.setdefault("NEO4J_PASSWORD", "test")
+
+from langchain.chains import GraphCypherQAChain
+from langchain_community.graphs.graph_store import GraphStore
+from langchain_core.language_models import FakeListChatModel
+
+import app_core
+
+
+def test_prompt_exposes_only_question():
+    prompt = app_core.build_prompt()
+    assert prompt.input_variables == ["question"]
+    text = prompt.format(question="Which actors played in the movie Casino?")
+    assert "Which actors played in the movie Casino?" in text
+    assert "__QUESTION__" not in text
+
+
+class _FakeGraph(GraphStore):
+    @property
+    def get_schema(self):
+        return ""
+
+    @property
+    def get_structured_schema(self):
+        return {}
+
+    def query(self, query, params={}):
+        return [{"a.name": "Robert De Niro"}]
+
+    def refresh_schema(self):
+        pass
+
+    def add_graph_documents(self, graph_documents, include_source=False):
+        raise NotImplementedError
+
+
+def test_chain_invokes_with_fake_llm():
+    llm = FakeListChatModel(responses=["MATCH (a) RETURN a.name", "Robert De Niro"])
+    chain = GraphCypherQAChain.from_llm(
+        graph=_FakeGraph(),
+        llm=llm,
+        cypher_prompt=app_core.build_prompt(),
+        allow_dangerous_requests=True,
+    )
+    result = chain.invoke("Which actors played in the movie Casino?")
+    assert result["result"] == "Robert De Niro"